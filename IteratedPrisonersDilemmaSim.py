@@ -6,13 +6,17 @@ Simulates iterated prisoners dilemma either among chosen strategies or against t
 Cooperating = not telling on the other person, represented as True in this program
 Ratting out/defecting = telling on the other person, represented as False in this program
 
+A prisoner's turns are packed into an int, one bit per round with the most recent round in the lowest bit
+(1 for cooperating, 0 for defecting)
+
 @author: Kiera Gross
 kiera.gross@stonybrook.edu
 """
 
-from enum import Enum
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum
 import random
-import math
 
 # these are the payoffs for each of the options
 both_rat = 0  # both players tell on each other
@@ -20,9 +24,16 @@ neither_rat = 5  # both players do not tell on each other
 ratter = 3  # the player that told on the other (who didn't tell)
 rattee = -1  # the player who was told on (but didn't tell themselves)
 
+# the (player one, player two) payoffs for a round, indexed by (player one's choice << 1) | player two's choice
+payoffs = ((both_rat, both_rat),  # neither cooperated
+           (ratter, rattee),  # only player two cooperated
+           (rattee, ratter),  # only player one cooperated
+           (neither_rat, neither_rat))  # both cooperated
+
 
-# these are the different strategies implemented in this program
-class Strategy(Enum):
+# these are the different strategies implemented in this program. they're ints underneath, so comparing them is as
+# cheap as comparing numbers
+class Strategy(IntEnum):
     # nice - always cooperates
     NICE = 1
     # greedy - always rats
@@ -40,6 +51,9 @@ class Strategy(Enum):
     # user - placeholder strategy for a user
     USER = 8
 
+# what's kept of a prisoner once they're done in the tournament, just what's needed to report on them
+Result = namedtuple('Result', ['final_score', 'elim_round', 'strategy'])
+
 """
 prisoner class - contains all the information on a prisoner for one simulation of iterated prisoner's dilemma vs 
 another prisoner. Also contains the strategy it follows.
@@ -47,16 +61,38 @@ another prisoner. Also contains the strategy it follows.
 class Prisoner:
     def __init__(self, strat):
         self.strategy = strat
-        self.turns = []
+        self.code = int(strat)  # the plain int for the strategy, for quick comparisons and lookups
+        # if it's not any of the others (like the USER placeholder), it plays like GREEDY
+        self.decide = strategy_plays.get(self.code, greedy)
+        self.turns = 0
+        self.record_turns = True  # whether to keep every turn in turns, only needed if the opponent looks at them
+        self.round_count = 0
+        self.last_move_out = None  # the last move played, None if there isn't one yet
+        self.prev_move_out = None  # the move played before the last one, None if there isn't one yet
+        self.opp_running = 0  # the opponent's cooperations minus their defections so far
         self.elim_round = 0
         self.final_score = 0
         self.elim = False
 
     def add_turns(self, move):
-        self.turns.append(move)
+        if self.record_turns:
+            self.turns = (self.turns << 1) | move
+        self.round_count = self.round_count + 1
+        self.prev_move_out = self.last_move_out
+        self.last_move_out = move
+
+    def add_opp_turn(self, move):
+        if move:
+            self.opp_running = self.opp_running + 1
+        else:
+            self.opp_running = self.opp_running - 1
 
     def reset_turns(self):
-        self.turns = []
+        self.turns = 0
+        self.round_count = 0
+        self.last_move_out = None
+        self.prev_move_out = None
+        self.opp_running = 0
 
     def add_to_score(self, num):
         self.final_score = self.final_score + num
@@ -71,25 +107,61 @@ class Prisoner:
     def eliminated(self):
         self.elim = True
 
+    def result(self):
+        return Result(self.final_score, self.elim_round, self.strategy)
+
+
+"""
+implements the strategy of always cooperating or NICE
+
+:param prisoner: the NICE prisoner, opponent: the other player
+:returns the play (True for cooperative, False for defecting)
+"""
+def nice(prisoner, opponent):
+    return True
+
+
+"""
+implements the strategy of always defecting or GREEDY
+
+:param prisoner: the GREEDY prisoner, opponent: the other player
+:returns the play (True for cooperative, False for defecting)
+"""
+def greedy(prisoner, opponent):
+    return False
+
+
+"""
+implements the strategy of "tit for tat" or TITFORTAT
+
+:param prisoner: the TITFORTAT prisoner, opponent: the other player
+:returns the play (True for cooperative, False for defecting)
+"""
+def tit_for_tat(prisoner, opponent):
+    if opponent.last_move_out is None:
+        return True
+    else:
+        return opponent.last_move_out
+
 
 """"
 implements the strategy of "nice until not" or NICEUNTIL
 
-:param last move: the last move that was played by NICEUNTIL, turns: the other player's turns so far
+:param prisoner: the NICEUNTIL prisoner, which relies on the last move it played, opponent: the other player
 :returns the play (True for cooperative, False for defecting)
 """
-def nice_until_not(last_move, turns):
-    if len(turns) == 0:
+def nice_until_not(prisoner, opponent):
+    if opponent.last_move_out is None:
         return True
-    if last_move:
-        if turns[-1]:
+    if prisoner.last_move_out:
+        if opponent.last_move_out:
             return True
         else:
             return False
-    elif len(turns) == 1:
+    elif opponent.prev_move_out is None:
         return False
     else:
-        if turns[-1] and turns[-2]:
+        if opponent.last_move_out and opponent.prev_move_out:
             return True
         else:
             return False
@@ -98,95 +170,167 @@ def nice_until_not(last_move, turns):
 """"
 implements the strategy of "average strategy" or AVESTRAT
 
-:param turns: the other player's turns so far
+:param prisoner: the AVESTRAT prisoner, which keeps a running count of the other player's turns, opponent: the other 
+player
 :returns the play (True for cooperative, False for defecting)
 """
-def average_strategy(turns):
-    if len(turns) == 0:
-        return True
-    ave = 0
-    for i in range(len(turns)):
-        if turns[i]:
-            ave = ave + 1
-        else:
-            ave = ave - 1
-    if ave >= 0:
+def average_strategy(prisoner, opponent):
+    # with no turns yet the count is zero, so it starts by cooperating
+    if prisoner.opp_running >= 0:
         return True
     else:
         return False
 
 
 """
-uses the strategy's name to determine the correct logic to use & finds if they would cooperate or defer that turn
-:param strat: the strategy, turns: the opponent's turns so far, our_turns: the turns we've played so far
-:return True for cooperate, false for defer
+implements the strategy of "random strategy" or RANSTRAT
+
+:param prisoner: the RANSTRAT prisoner, opponent: the other player
+:returns the play (True for cooperative, False for defecting)
 """
-def strategy_to_payoff(strat, turns, our_turns):
-    # some strategies rely on the last move the person took rather than the opponent
-    # if there was no previous turns, we just set this value to None
-    if len(our_turns) == 0:
-        last_move = None
-    else:
-        last_move = our_turns[-1]
-
-    # this would be a switch statement, but python doesn't do that... enjoy a bunch of ifs!
-    if strat.value == 4:
-        return nice_until_not(last_move, turns)
-    elif strat.value == 5:
-        return average_strategy(turns)
-    elif strat.value == 6:
-        if len(turns) == 0:
-            return True
-        else:
-            return turns[random.randint(0, len(turns)-1)]
-    elif strat.value == 7:
-        return bool(random.getrandbits(1))
-    elif strat.value == 3:
-        if len(turns) == 0:
-            return True
-        else:
-            return turns[-1]
-    elif strat.value == 1:
+def random_strategy(prisoner, opponent):
+    if opponent.round_count == 0:
         return True
-    else:           # if it's not any of the others, it's GREEDY
-        return False
+    else:
+        # random.random() scaled to the number of turns is a cheaper way to pick an index than random.randrange()
+        return bool((opponent.turns >> int(random.random() * opponent.round_count)) & 1)
+
 
+"""
+implements the strategy of picking a random move or RANDOM
 
+:param prisoner: the RANDOM prisoner, opponent: the other player
+:returns the play (True for cooperative, False for defecting)
 """
-uses the choice determined by strategy_to_payoff to calculate what the payoffs are for each player
+def random_move(prisoner, opponent):
+    return bool(random.getrandbits(1))
+
+
+# the function that decides each strategy's play. every prisoner looks up its function once when it's made, so picking
+# a play doesn't have to go through the strategies one by one
+strategy_plays = {
+    Strategy.NICE: nice,
+    Strategy.GREEDY: greedy,
+    Strategy.TITFORTAT: tit_for_tat,
+    Strategy.NICEUNTIL: nice_until_not,
+    Strategy.AVESTRAT: average_strategy,
+    Strategy.RANSTRAT: random_strategy,
+    Strategy.RANDOM: random_move,
+}
+
+# the matchups where both prisoners play the same move every round, mapped to (player one's move, player two's move).
+# the strategies that never defect first just cooperate with each other forever, and NICE and GREEDY never change
+never_defect_first = (Strategy.NICE, Strategy.TITFORTAT, Strategy.NICEUNTIL, Strategy.AVESTRAT, Strategy.RANSTRAT)
+fixed_matchups = {(strat1, strat2): (True, True) for strat1 in never_defect_first for strat2 in never_defect_first}
+fixed_matchups[(Strategy.GREEDY, Strategy.GREEDY)] = (False, False)
+fixed_matchups[(Strategy.NICE, Strategy.GREEDY)] = (True, False)
+fixed_matchups[(Strategy.GREEDY, Strategy.NICE)] = (False, True)
+
+# the strategies a random prisoner can have
+random_prisoner_types = (Strategy.NICE, Strategy.GREEDY, Strategy.RANDOM, Strategy.TITFORTAT, Strategy.RANSTRAT,
+                         Strategy.AVESTRAT, Strategy.NICEUNTIL)
+
+# the strategies whose plays depend on chance. every other matchup eventually repeats itself
+random_strategies = (Strategy.RANSTRAT, Strategy.RANDOM)
+# how many rounds at the start of a match to look through for a repeat before giving up
+cycle_search_rounds = 64
+
+
+"""
+uses the choice determined by each prisoner's strategy to calculate what the payoffs are for each player
 :param prisoner1: player one (a prisoner), prisoner2: player two (a prisoner), isuser: true if prisoner2 is a user, 
 userchoice: the decision (cooperate or defer) of the user
 :return prisoner1, prisoner2
 """
 def dilemma(prisoner1, prisoner2, isuser, userchoice):
     # we use True to be cooperate (don't rat out) and false to be accuse (do rat out)
-    prisoner1_choice = strategy_to_payoff(prisoner1.strategy, prisoner2.turns, prisoner1.turns)
+    prisoner1_choice = prisoner1.decide(prisoner1, prisoner2)
     prisoner2_choice = userchoice
     if not isuser:
-        prisoner2_choice = strategy_to_payoff(prisoner2.strategy, prisoner1.turns, prisoner2.turns)
+        prisoner2_choice = prisoner2.decide(prisoner2, prisoner1)
 
-    # keep track of what their choice was
+    # keep track of what their choice was, and what their opponent's choice was
     prisoner1.add_turns(prisoner1_choice)
     prisoner2.add_turns(prisoner2_choice)
+    prisoner1.add_opp_turn(prisoner2_choice)
+    prisoner2.add_opp_turn(prisoner1_choice)
 
-    # if they both cooperated, they both get the best score
-    if prisoner1_choice and prisoner2_choice:
-        prisoner1.add_to_score(neither_rat)
-        prisoner2.add_to_score(neither_rat)
-    else:
-        if prisoner1_choice:  # if prisoner1 cooperated, but not both
-            prisoner1.add_to_score(rattee)
-            prisoner2.add_to_score(ratter)
-        elif prisoner2_choice:  # if prisoner2 cooperated, but not both
-            prisoner1.add_to_score(ratter)
-            prisoner2.add_to_score(rattee)
-        else:  # if neither cooperated
-            prisoner1.add_to_score(both_rat)
-            prisoner2.add_to_score(both_rat)
+    # look up what each of them gets for this combination of choices
+    prisoner1_payoff, prisoner2_payoff = payoffs[(prisoner1_choice << 1) | prisoner2_choice]
+    prisoner1.final_score = prisoner1.final_score + prisoner1_payoff
+    prisoner2.final_score = prisoner2.final_score + prisoner2_payoff
 
     return prisoner1, prisoner2
 
 
+"""
+works out the final scores of a matchup in fixed_matchups straight away. Since the same thing happens every round, the 
+scores just grow by the same payoffs until the round limit or until someone hits the elimination value. Only the 
+scores are filled in, the prisoners' turns aren't recorded
+:param prisoner1: player one (a prisoner), prisoner2: player two (a prisoner), moves: the move each of them plays every 
+round, elim_num: the lowest value a prisoner can hit, round_max: the maximum number of rounds to play
+"""
+def fixed_match(prisoner1, prisoner2, moves, elim_num, round_max):
+    prisoner1_payoff, prisoner2_payoff = payoffs[(moves[0] << 1) | moves[1]]
+
+    # nobody plays at all if they start out at or under the elimination value
+    rounds = max(round_max, 0)
+    if elim_num >= 0:
+        rounds = 0
+    else:
+        # a prisoner losing points each round is eliminated on the first round they hit the elimination value
+        for payoff in (prisoner1_payoff, prisoner2_payoff):
+            if payoff < 0:
+                rounds = min(rounds, -(-elim_num // payoff))
+
+    prisoner1.final_score = rounds * prisoner1_payoff
+    prisoner2.final_score = rounds * prisoner2_payoff
+
+
+"""
+gives everything a prisoner's next play can depend on in a match without chance in it. If this is the same at the start 
+of two different rounds, everything in between will keep happening over and over
+:param prisoner: the prisoner
+:return a tuple of the prisoner's state
+"""
+def match_state(prisoner):
+    # only AVESTRAT looks at the running count, and it keeps growing for everyone else
+    if prisoner.strategy == Strategy.AVESTRAT:
+        return prisoner.last_move_out, prisoner.prev_move_out, prisoner.opp_running
+    return prisoner.last_move_out, prisoner.prev_move_out
+
+
+"""
+skips over as many repeats of a cycle of rounds as the round limit and the elimination value allow, adding the points 
+they would have scored. The prisoners' turns from the skipped rounds aren't recorded
+:param prisoner1: player one (a prisoner), prisoner2: player two (a prisoner), scores: the (player one, player two) 
+scores at the start of each round so far, cycle_start: the round the cycle started on, round_num: the current round 
+(where the cycle starts again), elim_num: the lowest value a prisoner can hit, round_max: the maximum number of rounds 
+to play
+:return the number of rounds skipped
+"""
+def skip_cycles(prisoner1, prisoner2, scores, cycle_start, round_num, elim_num, round_max):
+    cycle_length = round_num - cycle_start
+    cycles = (round_max - round_num) // cycle_length
+
+    current_scores = (prisoner1.final_score, prisoner2.final_score)
+    for i in range(2):
+        # how much the score changes over a cycle, and how far under its value at the start of the cycle it dips
+        # before any of the rounds in it
+        change = current_scores[i] - scores[cycle_start][i]
+        dip = min(score[i] for score in scores[cycle_start:round_num]) - scores[cycle_start][i]
+        # a cycle is only skipped if every round in it would have been played
+        headroom = current_scores[i] + dip - elim_num
+        if headroom <= 0:
+            cycles = 0
+        elif change < 0:
+            cycles = min(cycles, -(-headroom // -change))
+
+    prisoner1.final_score = prisoner1.final_score + cycles * (current_scores[0] - scores[cycle_start][0])
+    prisoner2.final_score = prisoner2.final_score + cycles * (current_scores[1] - scores[cycle_start][1])
+    return cycles * cycle_length
+
+
 """
 pits two prisoners against each other for the specified number of rounds or until one is eliminated. In a tie, one is 
 eliminated "at random" (since the order they are put in is random)
@@ -195,17 +339,45 @@ can hit, round_max: the maximum number of rounds to play
 :return prisoner1 & prisoner2, winner first
 """
 def match(prisoner1, prisoner2, elim_num, round_max):
-    # reset the prisoners, set the round number
+    # reset the prisoners
     prisoner1.reset_score()
     prisoner1.reset_turns()
     prisoner2.reset_score()
     prisoner2.reset_turns()
-    round_num = 1
 
-    # face off until one is eliminated or until the number of rounds is reached
-    while round_num <= round_max and prisoner1.final_score > elim_num and prisoner2.final_score > elim_num:
-        prisoner1, prisoner2 = dilemma(prisoner1, prisoner2, False, None)
-        round_num = round_num + 1
+    # only RANSTRAT looks through its opponent's whole history, so nobody else's opponent needs to keep one
+    prisoner1.record_turns = prisoner2.strategy == Strategy.RANSTRAT
+    prisoner2.record_turns = prisoner1.strategy == Strategy.RANSTRAT
+
+    # face off until one is eliminated or until the number of rounds is reached. if both of them will play the same
+    # move every round, the scores can be worked out without playing
+    moves = fixed_matchups.get((prisoner1.code, prisoner2.code))
+    if moves is not None:
+        fixed_match(prisoner1, prisoner2, moves, elim_num, round_max)
+    else:
+        # without chance involved, the match will start repeating itself. keep track of the state each round started
+        # in for a while, and once one comes up again skip ahead by whole cycles
+        seen = None
+        scores = []
+        if prisoner1.strategy not in random_strategies and prisoner2.strategy not in random_strategies:
+            seen = {}
+
+        round_num = 0
+        while round_num < round_max and prisoner1.final_score > elim_num and prisoner2.final_score > elim_num:
+            if seen is not None:
+                state = (match_state(prisoner1), match_state(prisoner2))
+                if state in seen:
+                    round_num = round_num + skip_cycles(prisoner1, prisoner2, scores, seen[state], round_num, elim_num,
+                                                        round_max)
+                    seen = None
+                    continue
+                elif round_num < cycle_search_rounds:
+                    seen[state] = round_num
+                    scores.append((prisoner1.final_score, prisoner2.final_score))
+                else:
+                    seen = None
+            dilemma(prisoner1, prisoner2, False, None)
+            round_num = round_num + 1
 
     # no matter what, the one with the lower score is eliminated, if there's a tie, one is eliminated anyway
     if prisoner1.final_score <= prisoner2.final_score:
@@ -216,53 +388,168 @@ def match(prisoner1, prisoner2, elim_num, round_max):
         return prisoner1, prisoner2
 
 
+"""
+plays out one part of the bracket to a single winner. The part is split in half, each half is played out to its own 
+winner, and then those two winners face off. Finishing one part of the bracket before moving to the next keeps the 
+prisoners in play close together instead of going over the whole list every round
+:param prisoners: a list of prisoners, start: the index of the first prisoner in this part of the bracket, end: the 
+index just past the last prisoner in this part, elim_num: the lowest value a prisoner can hit, round_max: the maximum 
+number of rounds to play, final_prisoners: the list the results of the eliminated prisoners are added to
+:return the winner of this part of the bracket
+"""
+def resolve_bracket(prisoners, start, end, elim_num, round_max, final_prisoners):
+    # a prisoner on their own just moves on
+    if end - start == 1:
+        return prisoners[start]
+
+    middle = (start + end) // 2
+    prisoner1 = resolve_bracket(prisoners, start, middle, elim_num, round_max, final_prisoners)
+    prisoner2 = resolve_bracket(prisoners, middle, end, elim_num, round_max, final_prisoners)
+    # match eliminates prisoner1 in a tie, so pick which half's winner goes first at random. otherwise the smaller half
+    # would always lose ties when the number of prisoners isn't a power of two
+    if random.getrandbits(1):
+        prisoner1, prisoner2 = prisoner2, prisoner1
+    winner, loser = match(prisoner1, prisoner2, elim_num, round_max)
+    final_prisoners.append(loser.result())  # this is to keep track of the final values of prisoners
+    return winner
+
+
+"""
+plays out a whole part of the bracket on its own. This is what each worker process runs
+:param prisoners: the prisoners in this part of the bracket, elim_num: the lowest value a prisoner can hit, round_max: 
+the maximum number of rounds to play
+:return the winner of this part of the bracket and the list of results of the prisoners eliminated in it
+"""
+def play_sub_bracket(prisoners, elim_num, round_max):
+    final_prisoners = []
+    winner = resolve_bracket(prisoners, 0, len(prisoners), elim_num, round_max, final_prisoners)
+    return winner, final_prisoners
+
+
+"""
+hands the parts of the bracket below a certain depth to the worker processes. The bracket is split the same way 
+resolve_bracket splits it
+:param pool: the worker processes, prisoners: a list of prisoners, start: the index of the first prisoner in this part 
+of the bracket, end: the index just past the last prisoner in this part, depth: how many more times to split the 
+bracket before handing it over, elim_num: the lowest value a prisoner can hit, round_max: the maximum number of rounds 
+to play
+:return a prisoner on their own, the pending result of a worker, or a (first half, second half) pair of either of these
+"""
+def split_bracket(pool, prisoners, start, end, depth, elim_num, round_max):
+    if end - start == 1:
+        return prisoners[start]
+    if depth == 0:
+        return pool.submit(play_sub_bracket, prisoners[start:end], elim_num, round_max)
+
+    middle = (start + end) // 2
+    return (split_bracket(pool, prisoners, start, middle, depth - 1, elim_num, round_max),
+            split_bracket(pool, prisoners, middle, end, depth - 1, elim_num, round_max))
+
+
+"""
+waits on the workers and plays the top of the bracket above the parts they handled
+:param part: what split_bracket returned for this part of the bracket, elim_num: the lowest value a prisoner can hit, 
+round_max: the maximum number of rounds to play, final_prisoners: the list the results of the eliminated prisoners 
+are added to
+:return the winner of this part of the bracket
+"""
+def join_bracket(part, elim_num, round_max, final_prisoners):
+    if isinstance(part, Prisoner):
+        return part
+    if isinstance(part, tuple):
+        prisoner1 = join_bracket(part[0], elim_num, round_max, final_prisoners)
+        prisoner2 = join_bracket(part[1], elim_num, round_max, final_prisoners)
+        # pick which one goes first at random so ties are broken fairly, the same as in resolve_bracket
+        if random.getrandbits(1):
+            prisoner1, prisoner2 = prisoner2, prisoner1
+        winner, loser = match(prisoner1, prisoner2, elim_num, round_max)
+        final_prisoners.append(loser.result())
+        return winner
+
+    winner, losers = part.result()
+    final_prisoners.extend(losers)
+    return winner
+
+
 """
 sets up pairwise matches among a group of prisoners, keeping the final match data for each
 :param prisoners: a list of prisoners, elim_num: the lowest value a prisoner can hit, round_max: the maximum number of 
-rounds to play
-:return a list of all the prisoners, with the winner in the last spot
+rounds to play, workers: the number of processes to play the matches in (the prisoners that come back from the other 
+processes are copies of the ones passed in). Starting the processes costs far more than a typical tournament, so this 
+is only worth it for very large ones. The worker processes seed their own random numbers, so random.seed() doesn't make 
+a run with more than one worker repeatable
+:return a list of the results of all the prisoners, with the winner in the last spot (empty if there were no prisoners)
 """
-def set_up_matches(prisoners, elim_num, round_max):
+def set_up_matches(prisoners, elim_num, round_max, workers=1):
     final_prisoners = []
-    current_winners = []
-    current_winners.extend(prisoners)
-
-    while len(current_winners) > 1:
-        # clear out the winners list to add the new winners only
-        current_winners.clear()
-        # shuffle the prisoners to make it fair
-        random.shuffle(prisoners)
-
-        # if there's an odd number of prisoners, just add the middle one to the winner's list
-        if len(prisoners) % 2 == 1:
-            extra = prisoners[len(prisoners)//2]
-            current_winners.append(extra)
-
-        # set the prisoners at opposite ends of the list against each other, working towards the middle of the list
-        for i in range(0, math.floor(len(prisoners)/2)):
-            winner, loser = match(prisoners[i], prisoners[len(prisoners)-i-1], elim_num, round_max)
-            current_winners.append(winner)
-            final_prisoners.append(loser)  # this is to keep track of the final values of prisoners
-
-        # the new set of prisoners to work with is the ones that won
-        prisoners.clear()
-        prisoners.extend(current_winners)
+
+    # with nobody to play there's no bracket to set up
+    if len(prisoners) == 0:
+        return final_prisoners
+
+    # shuffle the prisoners to make it fair. if the number of prisoners isn't a power of two, some of them will skip a
+    # round somewhere in the bracket
+    random.shuffle(prisoners)
+
+    if workers > 1 and len(prisoners) > workers:
+        # the matches in different parts of the bracket don't depend on each other, so split the bracket until there's
+        # a part for every worker. each worker reseeds its random numbers so they don't all play the same random moves
+        with ProcessPoolExecutor(max_workers=workers, initializer=random.seed) as pool:
+            parts = split_bracket(pool, prisoners, 0, len(prisoners), (workers - 1).bit_length(), elim_num, round_max)
+            winner = join_bracket(parts, elim_num, round_max, final_prisoners)
+    else:
+        winner = resolve_bracket(prisoners, 0, len(prisoners), elim_num, round_max, final_prisoners)
 
     # makes the last prisoner in the list the overall winner
-    final_prisoners.append(current_winners[0])
+    final_prisoners.append(winner.result())
 
-    # return the final state of all prisoners
+    # return the final results of all prisoners
     return final_prisoners
 
 
+"""
+runs one whole tournament from scratch. This is what each worker process runs for run_many
+:param strategies: the strategy of each prisoner in the tournament, elim_num: the lowest value a prisoner can hit, 
+round_max: the maximum number of rounds to play, seed: the seed for the random numbers in this tournament (None to 
+leave them as they are)
+:return a list of the results of all the prisoners, with the winner in the last spot
+"""
+def run_trial(strategies, elim_num, round_max, seed):
+    if seed is not None:
+        random.seed(seed)
+    prisoners = [Prisoner(strat) for strat in strategies]
+    return set_up_matches(prisoners, elim_num, round_max)
+
+
+"""
+runs the same tournament many times over, for looking at how the strategies do on average. The tournaments don't depend 
+on each other, so they can be spread over several processes
+:param strategies: the strategy of each prisoner in the tournament, n_trials: the number of tournaments to run, 
+elim_num: the lowest value a prisoner can hit, round_max: the maximum number of rounds to play, seed: if given, 
+tournament number t is seeded with seed + t so the runs can be repeated, workers: the number of processes to run the 
+tournaments in (without a seed, runs with more than one worker can't be repeated)
+:return a list with the result of set_up_matches for each tournament
+"""
+def run_many(strategies, n_trials, elim_num, round_max, seed=None, workers=1):
+    seeds = [None] * n_trials
+    if seed is not None:
+        seeds = [seed + trial for trial in range(n_trials)]
+
+    if workers > 1 and n_trials > 1:
+        # each worker reseeds its random numbers so unseeded tournaments don't all play out the same way
+        with ProcessPoolExecutor(max_workers=workers, initializer=random.seed) as pool:
+            futures = [pool.submit(run_trial, strategies, elim_num, round_max, trial_seed) for trial_seed in seeds]
+            return [future.result() for future in futures]
+    else:
+        return [run_trial(strategies, elim_num, round_max, trial_seed) for trial_seed in seeds]
+
+
 """
 gives a random prisoner from the strategies defined
 :return a random prisoner
 """
 def random_prisoner():
-    types = [Strategy.NICE, Strategy.GREEDY, Strategy.RANDOM, Strategy.TITFORTAT, Strategy.RANSTRAT,
-             Strategy.AVESTRAT, Strategy.NICEUNTIL]
-    prisoner = Prisoner(types[random.randint(0, 6)])
+    prisoner = Prisoner(random_prisoner_types[random.randrange(len(random_prisoner_types))])
     return prisoner
 
 
@@ -304,14 +591,14 @@ def versus_user():
             print("You chose to cooperate.")
         else:
             print("You chose to defect.")
-        if prisoner.turns[-1]:
+        if prisoner.last_move_out:
             print("The other prisoner chose to keep quiet." + "\n")
         else:
             print("The other prisoner chose to rat you out!" + "\n")
         print("Opponent Score: " + str(prisoner.final_score) + "\n")
         print("Your Score: " + str(user.final_score) + "\n")
         keep_playing_string = input("Do you want to keep playing? Hit 'y' for yes, 'n' for no: ")
-        if keep_playing_string is not 'y' and keep_playing is not 'Y':
+        if keep_playing_string.lower() != 'y':
             keep_playing = False
             print("Thanks for playing!")
         else:
@@ -324,9 +611,9 @@ prisoner themself. handles a bunch of user input and interactions.
 """
 def main():
     vs_or_sim = input("Would you like to put strategies against each other? Hit 'y' for yes, 'n' for no: ")
-    if vs_or_sim is not 'y' and vs_or_sim is not 'Y':
+    if vs_or_sim.lower() != 'y':
         vs_or_sim = input("Would you like to play against a randomly selected strategy? Hit 'y' for yes, 'n' for no: ")
-        if vs_or_sim is not 'y' and vs_or_sim is not 'Y':
+        if vs_or_sim.lower() != 'y':
             print("That's all this program can do. Have a nice day!")
             exit(0)
         else: